@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 from pathlib import Path
 
@@ -11,12 +12,14 @@ LOG_FORMAT = "%(asctime)s - %(levelname)s - %(name)s - %(message)s"
 
 def build_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(prog="uninews", description="University cooperation-news crawler")
-    p.add_argument("--out", help="Output file (.xlsx or .csv). Default: auto timestamp", default=None)
-    p.add_argument("--ext", help="Output extension when --out not provided (xlsx|csv)", default="xlsx")
+    p.add_argument("--out", help="Output file (.xlsx, .csv or .parquet). Default: auto timestamp", default=None)
+    p.add_argument("--ext", choices=("xlsx", "csv", "parquet"), default="xlsx",
+                   help="Output extension when --out not provided")
     p.add_argument("--max-per-site", type=int, default=10, help="Max articles per site")
     p.add_argument("--delay-min", type=float, default=1.0, help="Min delay seconds between pages")
     p.add_argument("--delay-max", type=float, default=3.0, help="Max delay seconds between pages")
     p.add_argument("--timeout", type=int, default=10, help="HTTP timeout seconds")
+    p.add_argument("--cache", help="SQLite HTTP cache path; re-runs skip unchanged pages", default=None)
     p.add_argument("--sites-file", type=Path, help="Optional CSV with name,url per line")
     p.add_argument("-v", "--verbose", action="count", default=0, help="-v for INFO, -vv for DEBUG")
     return p
@@ -53,6 +56,7 @@ def main() -> None:
         delay_min=args.delay_min,
         delay_max=args.delay_max,
         max_per_site=args.max_per_site,
+        cache_path=args.cache,
     )
 
     # sites
@@ -61,12 +65,19 @@ def main() -> None:
         sites = load_sites_from_csv(args.sites_file)
 
     crawler = UniversityNewsCrawler(cfg=cfg, sites=sites)
-    crawler.crawl()
+
+    async def run() -> None:
+        try:
+            await crawler.crawl()
+        finally:
+            await crawler.close()
+
+    asyncio.run(run())
 
     # output
     out_path = args.out or crawler.default_output(args.ext)
-    saved = crawler.save(out_path)
     df = crawler.to_dataframe()
+    saved = crawler.save(out_path, df=df)
 
     print(f"\nSaved {len(df)} rows to: {saved}")
     if not df.empty:
@@ -1,16 +1,43 @@
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import csv
+import itertools
 import logging
-import random
+import os
+import re
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterable
 from urllib.parse import urljoin, urlparse
 
+import aiohttp
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional fast parser; fall back to lxml+XPath
+    LexborHTMLParser = None
+
+try:
+    import ahocorasick
+except ImportError:  # optional fast keyword matcher; fall back to substring scan
+    ahocorasick = None
+
+try:
+    import brotli  # noqa: F401  # lets aiohttp decompress 'br' responses
+    _HAS_BROTLI = True
+except ImportError:
+    _HAS_BROTLI = False
+
+try:
+    from aiohttp_client_cache import CachedSession, SQLiteBackend
+except ImportError:  # optional on-disk HTTP cache
+    CachedSession = None
+    SQLiteBackend = None
 
 logger = logging.getLogger(__name__)
 
@@ -29,18 +56,175 @@ DEFAULT_SITES = {
 }
 
 NEWS_LIST_PATTERNS = ["news/", "article/", "info/", "content/", "xxgg/", "xwdt/"]
+_RETRY_STATUSES = frozenset({502, 503, 504})
+_MAX_BODY_BYTES = 512 * 1024
+_CONTENT_CLIP = 500
 NEWS_CONTENT_SELECTORS = {
     "title": ["h1", ".article-title", ".news-title", "title"],
     "time":  [".publish-time", ".article-time", ".news-time", "time"],
     "body":  [".article-content", ".news-content", ".content", "article"],
 }
-NEWS_LINK_SELECTORS = [
-    'a[href*="news"]',
-    'a[href*="article"]',
-    'a[href*="info"]',
-    'a[href*="content"]',
-    ".news-list a", ".article-list a", ".news-item a", ".list-item a",
-]
+_HREF_RE = re.compile(r"news|article|info|content")
+_URL_RE = re.compile(r"^https?://[^\s/][^\s]*$")
+_SKIP_HREF_PREFIXES = ("javascript:", "mailto:", "tel:", "#")
+_LINK_PARENT_CLASSES = frozenset({"news-list", "article-list", "news-item", "list-item"})
+FIELDS = ("university", "title", "publish_time", "content", "url", "link_text", "crawl_time")
+
+_PARSER = lxml_html.HTMLParser(remove_comments=True)
+
+
+def _class_xpath(cls: str) -> str:
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+# XPath equivalents of NEWS_CONTENT_SELECTORS, compiled once at import;
+# tuples keep the same priority order as the CSS lists
+_CONTENT_XPATHS = {
+    "title": tuple(etree.XPath(x) for x in (
+        "//h1", _class_xpath("article-title"), _class_xpath("news-title"), "//title",
+    )),
+    "time": tuple(etree.XPath(x) for x in (
+        _class_xpath("publish-time"), _class_xpath("article-time"),
+        _class_xpath("news-time"), "//time",
+    )),
+    "body": tuple(etree.XPath(x) for x in (
+        _class_xpath("article-content"), _class_xpath("news-content"),
+        _class_xpath("content"), "//article",
+    )),
+}
+_ANCHOR_XP = etree.XPath("//a[@href]")
+
+
+def _is_valid_url(url: str) -> bool:
+    # cheap regex gate; urlparse allocates a SplitResult per call and this
+    # runs for every candidate anchor
+    return bool(_URL_RE.match(url))
+
+
+def _extract_links(html: str, base_url: str) -> list[tuple[str, str]]:
+    links: set[tuple[str, str]] = set()
+    # one anchor walk per page; classify each <a> by href substring or
+    # parent class instead of running one CSS selector per tree traversal
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+
+        def wanted(node) -> bool:
+            if _HREF_RE.search(node.attributes.get("href") or ""):
+                return True
+            parent = node.parent
+            classes = parent.attributes.get("class") if parent is not None else None
+            return bool(classes and _LINK_PARENT_CLASSES.intersection(classes.split()))
+
+        anchors = (
+            (node.attributes.get("href"), node.text(strip=True))
+            for node in tree.css("a[href]")
+            if wanted(node)
+        )
+    else:
+        # parser errors must not escape: lxml's ParserError drags along an
+        # unpicklable error log, so it cannot cross the process-pool boundary
+        try:
+            tree = lxml_html.fromstring(html, parser=_PARSER)
+        except etree.ParserError as e:
+            logger.warning("parse failed for %s: %s", base_url, e)
+            return []
+
+        def wanted(a) -> bool:
+            if _HREF_RE.search(a.get("href") or ""):
+                return True
+            parent = a.getparent()
+            classes = parent.get("class") if parent is not None else None
+            return bool(classes and _LINK_PARENT_CLASSES.intersection(classes.split()))
+
+        anchors = (
+            (a.get("href"), a.text_content().strip())
+            for a in _ANCHOR_XP(tree)
+            if wanted(a)
+        )
+    for href, text in anchors:
+        if not href or href.startswith(_SKIP_HREF_PREFIXES):
+            continue
+        full = urljoin(base_url, href)
+        if not _is_valid_url(full):
+            continue
+        if text:
+            links.add((full, text))
+    return list(links)
+
+
+def _extract_content(html: str, url: str) -> dict:
+    if LexborHTMLParser is not None:
+        tree = LexborHTMLParser(html)
+
+        def pick(key: str) -> str:
+            for s in NEWS_CONTENT_SELECTORS[key]:
+                el = tree.css_first(s)
+                if el:
+                    txt = el.text(strip=True)
+                    if txt:
+                        return txt
+            return ""
+
+        def fallback() -> str:
+            body = tree.body
+            return body.text(separator=" ", strip=True) if body else ""
+    else:
+        try:
+            tree = lxml_html.fromstring(html, parser=_PARSER)
+        except etree.ParserError as e:
+            logger.warning("parse failed for %s: %s", url, e)
+            return {"title": "", "publish_time": "", "content": "", "url": url}
+
+        def pick(key: str) -> str:
+            for xp in _CONTENT_XPATHS[key]:
+                for el in xp(tree):
+                    txt = el.text_content().strip()
+                    if txt:
+                        return txt
+            return ""
+
+        def fallback() -> str:
+            parts: list[str] = []
+            size = 0
+            for chunk in tree.itertext():
+                chunk = chunk.strip()
+                if not chunk:
+                    continue
+                parts.append(chunk)
+                size += len(chunk)
+                if size > _CONTENT_CLIP:
+                    break
+            return "".join(parts)
+
+    title = pick("title")
+    publish_time = pick("time")
+    content = pick("body") or fallback()
+    if len(content) > _CONTENT_CLIP:
+        content = content[:_CONTENT_CLIP] + "..."
+
+    return {"title": title, "publish_time": publish_time, "content": content, "url": url}
+
+
+class _HostLimiter:
+    """Token bucket keeping per-host politeness without serializing hosts."""
+
+    def __init__(self, rate: float, burst: float = 2.0) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.tokens = 1.0
+        self.last = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1.0:
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+                self.last = time.monotonic()
+                self.tokens = 1.0
+            self.tokens -= 1.0
 
 
 @dataclass
@@ -49,6 +233,8 @@ class CrawlConfig:
     delay_min: float = 1.0
     delay_max: float = 3.0
     max_per_site: int = 10
+    concurrency: int = 5
+    cache_path: str | None = None
     user_agent: str = (
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
         "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -63,138 +249,236 @@ class UniversityNewsCrawler:
     cfg: CrawlConfig = field(default_factory=CrawlConfig)
 
     def __post_init__(self) -> None:
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             "User-Agent": self.cfg.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
             "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
-        })
-        self.rows: list[dict] = []
+            "Accept-Encoding": "br, gzip, deflate" if _HAS_BROTLI else "gzip, deflate",
+        }
+        self.session: aiohttp.ClientSession | None = None
+        self._pool: concurrent.futures.ProcessPoolExecutor | None = None
+        self._max_retries = 2
+        self._retry_backoff = 0.3
+        self._limiters: dict[str, _HostLimiter] = {}
+        self._kw_lower = tuple(kw.lower() for kw in self.keywords)
+        self._kw_ac = None
+        if ahocorasick is not None:
+            self._kw_ac = ahocorasick.Automaton()
+            for kw in self.keywords:
+                self._kw_ac.add_word(kw.lower(), kw)
+            self._kw_ac.make_automaton()
+        # columnar storage: 7 parallel lists instead of one dict per row
+        self._cols: dict[str, list[str]] = {k: [] for k in FIELDS}
 
     # ---------------- helpers ----------------
-    @staticmethod
-    def _is_valid_url(url: str) -> bool:
-        try:
-            res = urlparse(url)
-            return bool(res.scheme and res.netloc)
-        except Exception:
-            return False
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=32,
+                limit_per_host=max(self.cfg.concurrency, 2),
+                keepalive_timeout=30,
+            )
+            kwargs = dict(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.cfg.timeout),
+            )
+            if self.cfg.cache_path and CachedSession is not None:
+                # unchanged pages are served from SQLite on re-runs
+                self.session = CachedSession(
+                    cache=SQLiteBackend(
+                        self.cfg.cache_path,
+                        expire_after=3600,
+                        allowed_methods=("GET",),
+                        cache_control=True,
+                    ),
+                    **kwargs,
+                )
+            else:
+                if self.cfg.cache_path:
+                    logger.warning(
+                        "aiohttp-client-cache is not installed; crawling without cache"
+                    )
+                self.session = aiohttp.ClientSession(**kwargs)
+        return self.session
 
-    def _get(self, url: str) -> str | None:
-        try:
-            resp = self.session.get(url, timeout=self.cfg.timeout)
-            resp.encoding = resp.encoding or "utf-8"
-            resp.raise_for_status()
-            return resp.text
-        except requests.RequestException as e:
-            logger.warning("GET failed %s: %s", url, e)
+    def _ensure_pool(self) -> concurrent.futures.ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=min(4, os.cpu_count() or 1),
+            )
+        return self._pool
+
+    async def close(self) -> None:
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _limiter_for(self, url: str) -> _HostLimiter | None:
+        avg_delay = (self.cfg.delay_min + self.cfg.delay_max) / 2
+        if avg_delay <= 0:
+            # explicit no-delay configuration: don't throttle at all
             return None
+        host = urlparse(url).netloc
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = _HostLimiter(rate=1.0 / avg_delay)
+        return limiter
+
+    async def _get(self, url: str) -> str | None:
+        session = await self._ensure_session()
+        limiter = self._limiter_for(url)
+        last_err: Exception | None = None
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                await asyncio.sleep(self._retry_backoff * (2 ** (attempt - 1)))
+            if limiter is not None:
+                await limiter.acquire()
+            try:
+                async with session.get(url) as resp:
+                    if resp.status in _RETRY_STATUSES:
+                        last_err = aiohttp.ClientResponseError(
+                            resp.request_info, resp.history, status=resp.status,
+                        )
+                        continue
+                    resp.raise_for_status()
+                    # read at most 512 KB; article pages beyond that only feed
+                    # the 500-char content clip anyway
+                    raw = await resp.content.read(_MAX_BODY_BYTES)
+                    try:
+                        encoding = resp.get_encoding()
+                    except RuntimeError:
+                        encoding = "utf-8"
+                    return raw.decode(encoding or "utf-8", errors="replace")
+            except aiohttp.ClientResponseError as e:
+                # non-retryable status (e.g. the 404s from probing list
+                # patterns): fail fast instead of burning retry attempts
+                logger.warning("GET failed %s: %s", url, e)
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                last_err = e
+        logger.warning("GET failed %s: %s", url, last_err)
+        return None
 
     def _contains_kw(self, text: str | None) -> bool:
         if not text:
             return False
         tl = text.lower()
-        return any(kw.lower() in tl for kw in self.keywords)
-
-    def _extract_links(self, html: str, base_url: str) -> list[tuple[str, str]]:
-        soup = BeautifulSoup(html, "lxml")
-        links: list[tuple[str, str]] = []
-        for sel in NEWS_LINK_SELECTORS:
-            for a in soup.select(sel):
-                href = a.get("href")
-                if not href:
-                    continue
-                full = urljoin(base_url, href)
-                if not self._is_valid_url(full):
-                    continue
-                text = a.get_text(strip=True)
-                if text:
-                    links.append((full, text))
-        return list({(u, t) for (u, t) in links})  # dedupe
+        if self._kw_ac is not None:
+            # single linear DFA pass over the text instead of one scan per keyword
+            return next(self._kw_ac.iter(tl), None) is not None
+        return any(kw in tl for kw in self._kw_lower)
 
-    def _extract_content(self, html: str, url: str) -> dict:
-        soup = BeautifulSoup(html, "lxml")
+    # ---------------- core ----------------
+    async def crawl_site(self, name: str, base_url: str) -> None:
+        logger.info("Crawling %s", name)
+        candidates: set[tuple[str, str]] = set()
 
-        def pick(selectors: list[str]) -> str:
-            for s in selectors:
-                el = soup.select_one(s)
-                if el:
-                    txt = el.get_text(strip=True)
-                    if txt:
-                        return txt
-            return ""
+        # homepage + common news-list paths, fetched concurrently
+        urls = [base_url] + [urljoin(base_url, pat) for pat in NEWS_LIST_PATTERNS]
+        pages = await asyncio.gather(*(self._get(u) for u in urls), return_exceptions=True)
 
-        title = pick(NEWS_CONTENT_SELECTORS["title"])
-        publish_time = pick(NEWS_CONTENT_SELECTORS["time"])
-        content = pick(NEWS_CONTENT_SELECTORS["body"]) or soup.get_text(strip=True)
-        if len(content) > 500:
-            content = content[:500] + "..."
+        # parse off the event loop so extraction overlaps the remaining fetches
+        loop = asyncio.get_running_loop()
+        pool = self._ensure_pool()
+        # no page-level keyword gate: it lowercased whole pages only to
+        # pre-filter links that the anchor-text check below narrows anyway;
+        # blank bodies (a 200 with no content) have nothing to parse
+        to_parse = [h for h in pages if isinstance(h, str) and h.strip()]
+        for links in await asyncio.gather(*(
+            loop.run_in_executor(pool, _extract_links, h, base_url) for h in to_parse
+        )):
+            candidates.update(links)
 
-        return {"title": title, "publish_time": publish_time, "content": content, "url": url}
+        # filter to links whose anchor contains keywords, capped at max_per_site
+        filtered = list(itertools.islice(
+            ((u, t) for (u, t) in candidates if self._contains_kw(t)),
+            self.cfg.max_per_site,
+        ))
+        logger.info("[%s] candidate links: %d", name, len(filtered))
 
-    # ---------------- core ----------------
-    def crawl_site(self, name: str, base_url: str) -> None:
-        logger.info("Crawling %s", name)
-        candidates: list[tuple[str, str]] = []
+        sem = asyncio.Semaphore(self.cfg.concurrency)
+        # one strftime per site; every row of this crawl shares the timestamp
+        crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        # try common news-list paths
-        for pat in NEWS_LIST_PATTERNS:
-            html = self._get(urljoin(base_url, pat))
+        async def fetch_article(url: str, link_text: str) -> None:
+            async with sem:
+                html = await self._get(url)
             if not html:
-                continue
-            if self._contains_kw(html):
-                candidates += self._extract_links(html, base_url)
-
-        # also scan homepage
-        home = self._get(base_url)
-        if home:
-            candidates += self._extract_links(home, base_url)
-
-        # filter to links whose anchor contains keywords
-        uniq = list({(u, t) for (u, t) in candidates})
-        filtered = [(u, t) for (u, t) in uniq if self._contains_kw(t)]
-        logger.info("[%s] candidate links: %d", name, len(filtered))
+                return
+            data = await loop.run_in_executor(pool, _extract_content, html, url)
+            values = (
+                name, data["title"], data["publish_time"], data["content"],
+                data["url"], link_text, crawl_time,
+            )
+            for k, v in zip(FIELDS, values):
+                self._cols[k].append(v)
 
-        for i, (url, link_text) in enumerate(filtered[: self.cfg.max_per_site], start=1):
-            html = self._get(url)
-            if not html:
-                continue
-            data = self._extract_content(html, url)
-            self.rows.append({
-                "university": name,
-                "title": data["title"],
-                "publish_time": data["publish_time"],
-                "content": data["content"],
-                "url": data["url"],
-                "link_text": link_text,
-                "crawl_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            })
-            time.sleep(random.uniform(self.cfg.delay_min, self.cfg.delay_max))
-
-    def crawl(self, sites: dict[str, str] | None = None) -> list[dict]:
+        await asyncio.gather(*(fetch_article(url, text) for url, text in filtered))
+
+    async def crawl(self, sites: dict[str, str] | None = None) -> list[dict]:
         target = sites or self.sites
-        for name, url in target.items():
-            try:
-                self.crawl_site(name, url)
-            except Exception as e:
-                logger.error("Error on %s: %s", name, e)
-        return self.rows
+        results = await asyncio.gather(
+            *(self.crawl_site(name, url) for name, url in target.items()),
+            return_exceptions=True,
+        )
+        for name, res in zip(target, results):
+            if isinstance(res, Exception):
+                logger.error("Error on %s: %s", name, res)
+        return [dict(zip(FIELDS, vals)) for vals in self._row_values()]
 
     # ---------------- output ----------------
+    def _row_values(self):
+        return zip(*(self._cols[k] for k in FIELDS))
+
     def to_dataframe(self) -> pd.DataFrame:
-        return pd.DataFrame(self.rows)
+        return pd.DataFrame(self._cols, copy=False)
 
-    def save(self, path: str) -> str:
-        df = self.to_dataframe()
+    def save(self, path: str, df: pd.DataFrame | None = None) -> str:
+        # stream rows straight to disk; only parquet goes through pandas,
+        # reusing the caller's DataFrame when one was already built
         if path.lower().endswith(".xlsx"):
-            df.to_excel(path, index=False, engine="openpyxl")
+            self._save_xlsx(path)
         elif path.lower().endswith(".csv"):
-            df.to_csv(path, index=False)
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                w.writerow(FIELDS)
+                w.writerows(self._row_values())
+        elif path.lower().endswith(".parquet"):
+            if df is None:
+                df = self.to_dataframe()
+            df.to_parquet(path, engine="pyarrow", compression="zstd")
         else:
-            raise ValueError("Output must end with .xlsx or .csv")
+            raise ValueError("Output must end with .xlsx, .csv or .parquet")
         return path
 
+    def _save_xlsx(self, path: str) -> None:
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        if xlsxwriter is not None:
+            # constant_memory flushes each row; much faster than openpyxl's
+            # pure-Python cell writes
+            wb = xlsxwriter.Workbook(path, {"constant_memory": True})
+            ws = wb.add_worksheet()
+            ws.write_row(0, 0, FIELDS)
+            for i, row in enumerate(self._row_values(), start=1):
+                ws.write_row(i, 0, row)
+            wb.close()
+        else:
+            from openpyxl import Workbook
+
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet()
+            ws.append(list(FIELDS))
+            for row in self._row_values():
+                ws.append(list(row))
+            wb.save(path)
+
     @staticmethod
     def default_output(ext: str = "xlsx") -> str:
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"university_cooperation_news_{ts}.{ext}"
\ No newline at end of file
+        return f"university_cooperation_news_{ts}.{ext}"